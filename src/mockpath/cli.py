@@ -1,52 +1,162 @@
-import json
+import asyncio
+import collections
+import os
+import signal
+import socket
+import sys
 import threading
-import time
-from dataclasses import dataclass, field
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from pathlib import Path
-from urllib.parse import urlparse, parse_qs
+from typing import Callable, NamedTuple
 
 import click
+import httptools
+import orjson
 import yaml
 
+from .dispatch import (
+    MatchEntry,
+    RouteEntry,
+    build_frame,
+    canonical,
+    dispatch,
+    freeze,
+    method_not_allowed_frame,
+    needs_body,
+)
 
-@dataclass
-class MatchEntry:
-    params: dict[str, str] | None
-    request_body: object | None
-    status: int
-    response: object
+try:
+    from watchfiles import watch
+except ImportError:  # optional: pip install "mockpath[reload]"
+    watch = None
 
+# libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
-class RouteEntry:
-    status: int
-    default_response: object
-    matches: list[MatchEntry] = field(default_factory=list)
 
+def _encode(body: object) -> bytes:
+    return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS) if body is not None else b""
 
-def load_specs(spec_dir: Path) -> dict[tuple[str, str], RouteEntry]:
-    routes: dict[tuple[str, str], RouteEntry] = {}
 
-    for yaml_path in sorted(spec_dir.rglob("*.yaml")):
+def _query_value(value) -> bool:
+    # A parsed query only yields str, a tuple of str for repeated keys, or
+    # None for an absent key; any other expected value can never be equal.
+    if value is None or isinstance(value, str):
+        return True
+    return isinstance(value, tuple) and all(isinstance(v, str) for v in value)
+
+
+def _index_params(matches: list[MatchEntry]):
+    tables: dict[tuple[str, ...], tuple[int, tuple[str, ...], dict[tuple, MatchEntry]]] = {}
+    for m in matches:
+        if m.params is None:
+            continue
+        names = tuple(sys.intern(k) if isinstance(k, str) else k for k in sorted(m.params, key=str))
+        values = tuple(freeze(m.params[k]) for k in names)
+        # Entries no request can satisfy are dropped so they never cost a probe
+        if not all(_query_value(v) for v in values):
+            continue
+        if names not in tables:
+            tables[names] = (m.order, names, {})
+        tables[names][2].setdefault(values, m)
+    return list(tables.values())
+
+
+def _index_bodies(matches: list[MatchEntry]):
+    index: dict[bytes, MatchEntry] = {}
+    fallback: list[MatchEntry] = []
+    for m in matches:
+        try:
+            index.setdefault(canonical(m.request_body), m)
+        except orjson.JSONEncodeError:
+            fallback.append(m)
+    return index, fallback
+
+
+def _walk_specs(directory: str):
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_specs(entry.path)
+            elif entry.name.endswith((".yaml", ".json")) and entry.is_file():
+                yield entry
+
+
+def _load_yaml(data: bytes) -> object:
+    return yaml.load(data, Loader=_YamlLoader)
+
+
+# Parsed spec files keyed by ((path, st_mtime_ns, st_size), loader), carried
+# across reloads so unchanged files are not parsed again. The loader is part
+# of the key because a .yaml spec can also be referenced as a JSON file.
+_parse_cache: dict[tuple[tuple[str, int, int], Callable[[bytes], object]], object] = {}
+
+
+def _stat_and_read(entry: os.DirEntry) -> tuple[tuple[str, int, int], bytes | None]:
+    st = entry.stat()
+    key = (entry.path, st.st_mtime_ns, st.st_size)
+    loads = _load_yaml if entry.name.endswith(".yaml") else orjson.loads
+    if (key, loads) in _parse_cache:
+        return key, None
+    with open(entry.path, "rb") as f:
+        return key, f.read()
+
+
+class Specs(NamedTuple):
+    routes: dict[str, dict[str, RouteEntry]]
+    # path -> prebuilt 405 response listing the methods that path does serve
+    not_allowed: dict[str, bytes]
+
+
+def load_specs(spec_dir: Path) -> Specs:
+    global _parse_cache
+    routes: dict[str, dict[str, RouteEntry]] = {}
+    cache: dict[tuple[tuple[str, int, int], Callable[[bytes], object]], object] = {}
+
+    # Stat and read the whole tree up front on a thread pool; parsing below
+    # only touches memory. Files already in _parse_cache are stat-ed only.
+    entries = list(_walk_specs(str(spec_dir)))
+    with ThreadPoolExecutor() as pool:
+        files = {key[0]: (key, data) for key, data in pool.map(_stat_and_read, entries)}
+
+    def parse(path: Path, loads: Callable[[bytes], object]) -> object:
+        stat_key, data = files[str(path)]
+        key = (stat_key, loads)
+        if key not in cache:
+            if key in _parse_cache:
+                cache[key] = _parse_cache[key]
+            else:
+                cache[key] = loads(data if data is not None else path.read_bytes())
+        return cache[key]
+
+    def read_json(path: Path, missing_ok: bool = False) -> object:
+        if str(path) not in files:
+            # Convention files live in the walked tree, so absent means missing.
+            # Explicit references may point outside it.
+            if missing_ok:
+                return None
+            st = path.stat()
+            files[str(path)] = ((str(path), st.st_mtime_ns, st.st_size), None)
+        return parse(path, orjson.loads)
+
+    yaml_paths = sorted(Path(e.path) for e in entries if e.name.endswith(".yaml"))
+    for yaml_path in yaml_paths:
         parts = yaml_path.stem.split(".")
         if len(parts) < 2:
             continue
-        name, method = parts[0], parts[1].upper()
+        name, method = parts[0], sys.intern(parts[1].upper())
 
         rel = yaml_path.relative_to(spec_dir).parent
-        url_path = "/" + "/".join([*rel.parts, name]) if rel.parts else "/" + name
+        url_path = sys.intern("/" + "/".join([*rel.parts, name]) if rel.parts else "/" + name)
 
-        with open(yaml_path) as f:
-            config = yaml.safe_load(f) or {}
+        config = parse(yaml_path, _load_yaml) or {}
 
         default_status = config.get("status", 200)
 
         resp_file = yaml_path.with_name(f"{name}.{parts[1]}.resp.json")
-        default_response = None
-        if resp_file.exists():
-            with open(resp_file) as f:
-                default_response = json.load(f)
+        default_response = read_json(resp_file, missing_ok=True)
 
         matches: list[MatchEntry] = []
         for i, m in enumerate(config.get("matches", []), start=1):
@@ -56,123 +166,332 @@ def load_specs(spec_dir: Path) -> dict[tuple[str, str], RouteEntry]:
             if "response" in m:
                 match_response = m["response"]
             elif "response_file" in m:
-                rf = yaml_path.parent / m["response_file"]
-                with open(rf) as f:
-                    match_response = json.load(f)
+                match_response = read_json(yaml_path.parent / m["response_file"])
             else:
                 conv_file = yaml_path.with_name(f"{name}.{parts[1]}.resp.{i}.json")
-                match_response = None
-                if conv_file.exists():
-                    with open(conv_file) as f:
-                        match_response = json.load(f)
+                match_response = read_json(conv_file, missing_ok=True)
 
             # Resolve request body: inline > request_file > convention
             req_body = None
             if "request" in m:
                 req_body = m["request"]
             elif "request_file" in m:
-                rf = yaml_path.parent / m["request_file"]
-                with open(rf) as f:
-                    req_body = json.load(f)
+                req_body = read_json(yaml_path.parent / m["request_file"])
             else:
                 req_file = yaml_path.with_name(f"{name}.{parts[1]}.req.{i}.json")
-                if req_file.exists():
-                    with open(req_file) as f:
-                        req_body = json.load(f)
+                req_body = read_json(req_file, missing_ok=True)
 
             matches.append(MatchEntry(
                 params=m.get("params"),
                 request_body=req_body,
                 status=match_status,
                 response=match_response,
+                frame=build_frame(match_status, _encode(match_response)),
+                order=i,
             ))
 
-        routes[(method, url_path)] = RouteEntry(
+        params_index = _index_params(matches)
+        body_matches = [m for m in matches if m.params is None and m.request_body is not None]
+        body_index, body_fallback = _index_bodies(body_matches)
+        routes.setdefault(method, {})[url_path] = RouteEntry(
             status=default_status,
             default_response=default_response,
+            default_frame=build_frame(default_status, _encode(default_response)),
             matches=matches,
+            params_index=params_index,
+            body_matches=body_matches,
+            body_index=body_index,
+            body_fallback=body_fallback,
+            needed_keys=frozenset(k for _, names, _ in params_index for k in names),
         )
 
-    return routes
+    methods_by_path: dict[str, set[str]] = {}
+    for method, by_path in routes.items():
+        for url_path in by_path:
+            methods_by_path.setdefault(url_path, set()).add(method)
+    not_allowed = {p: method_not_allowed_frame(ms) for p, ms in methods_by_path.items()}
 
+    _parse_cache = cache
+    return Specs(routes, not_allowed)
 
-routes: dict[tuple[str, str], RouteEntry] = {}
 
+# Replaced wholesale on reload. Readers take one reference per request, so
+# they never see routes and not_allowed from different loads.
+specs = Specs({}, {})
 
-class MockHandler(BaseHTTPRequestHandler):
-    protocol_version = "HTTP/1.1"
+_BAD_REQUEST = build_frame(400, orjson.dumps({"error": "Bad Request"}), b"Connection: close\r\n")
+_INTERNAL_ERROR = build_frame(500, orjson.dumps({"error": "Internal Server Error"}), b"Connection: close\r\n")
+_CONTINUE = b"HTTP/1.1 100 Continue\r\n\r\n"
 
-    def handle_request(self):
-        parsed = urlparse(self.path)
-        path = parsed.path.rstrip("/") or "/"
-        method = self.command.upper()
-        query = parse_qs(parsed.query)
-        query_flat = {k: v[0] if len(v) == 1 else v for k, v in query.items()}
+# httptools hands us the method as bytes; map the common ones straight to
+# the interned strings used in the route keys.
+_METHODS = {m.encode(): sys.intern(m) for m in ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")}
 
-        path_exists = any(p == path for (_, p) in routes)
+# Refreshed once a second by the event loop, as nginx does, rather than
+# formatted per response.
+_date_header = b""
 
-        route = routes.get((method, path))
-        if not route:
-            self._drain()
-            status = 405 if path_exists else 404
-            payload = json.dumps({"error": "Method Not Allowed" if status == 405 else "Not Found"}).encode()
-            self.send_response(status)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(payload)))
-            self.end_headers()
-            self.wfile.write(payload)
-            return
 
-        body = None
-        body_read = False
-        for m in route.matches:
-            if m.params is not None:
-                if all(query_flat.get(k) == v for k, v in m.params.items()):
-                    self._drain()
-                    self._send(m.status, m.response)
-                    return
-            elif m.request_body is not None:
-                if not body_read:
-                    body = self._read_body()
-                    body_read = True
-                if body == m.request_body:
-                    self._send(m.status, m.response)
-                    return
-
-        if not body_read:
-            self._drain()
-        self._send(route.status, route.default_response)
-
-    def _drain(self):
-        length = int(self.headers.get("Content-Length", 0))
-        if length > 0:
-            self.rfile.read(length)
-
-    def _read_body(self):
-        length = int(self.headers.get("Content-Length", 0))
-        if length == 0:
-            return None
+def _refresh_date(loop: asyncio.AbstractEventLoop):
+    global _date_header
+    _date_header = b"Date: %s\r\n" % formatdate(usegmt=True).encode("ascii")
+    loop.call_later(1, _refresh_date, loop)
+
+
+# Access log lines go to a writer thread so the event loop never blocks on
+# stdout; the loop only appends to a deque.
+access_log = True
+_log_queue: collections.deque[tuple[str, str, int]] = collections.deque()
+_log_ready = threading.Event()
+
+
+def _log_writer():
+    while True:
+        _log_ready.wait()
+        _log_ready.clear()
+        lines = []
+        while _log_queue:
+            method, target, status = _log_queue.popleft()
+            lines.append(f"  {method} {target} → {status}")
+        if lines:
+            click.echo("\n".join(lines))
+
+
+class MockProtocol(asyncio.Protocol):
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            # Small prebuilt frames must not sit behind Nagle's algorithm.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.parser = httptools.HttpRequestParser(self)
+        self.url = b""
+        self.body: list[bytes] = []
+        self.keep_body: bool | None = None
+        self.expect_continue = False
+        self.framing: list[bytes] = []
+        self.replay: bytes | None = None
+        self.specs = specs
+
+    def data_received(self, data: bytes):
         try:
-            return json.loads(self.rfile.read(length))
-        except (json.JSONDecodeError, ValueError):
-            return None
+            self.parser.feed_data(data)
+        except httptools.HttpParserUpgrade as exc:
+            # There is no protocol to switch to (h2c, websocket), so the
+            # request is served as plain HTTP/1.1 and parsing carries on.
+            offset = exc.args[0]
+            replay = self.replay
+            if replay is not None:
+                # Its body is still unread: a fresh parser reads it after the
+                # replayed request line, then goes on with later requests.
+                self.parser = httptools.HttpRequestParser(self)
+                self.data_received(replay + data[offset:])
+            elif offset < len(data) and not self.transport.is_closing():
+                self.data_received(data[offset:])
+        except httptools.HttpParserCallbackError:
+            # A bug in a callback, not a malformed request
+            traceback.print_exc()
+            self._write(_INTERNAL_ERROR)
+            self.transport.close()
+        except httptools.HttpParserError:
+            self._write(_BAD_REQUEST)
+            self.transport.close()
+
+    def on_message_begin(self):
+        self.url = b""
+        self.body = []
+        self.keep_body = None
+        self.expect_continue = False
+        self.framing = []
+        self.replay = None
+        # One snapshot per request, so a reload between the body and the
+        # dispatch cannot change which route the body was kept for.
+        self.specs = specs
+
+    def on_url(self, url: bytes):
+        self.url += url
+
+    def on_header(self, name: bytes, value: bytes):
+        size = len(name)
+        if size == 6 and name.lower() == b"expect":
+            self.expect_continue = value.lower() == b"100-continue"
+        elif (size == 14 or size == 17) and name.lower() in (b"content-length", b"transfer-encoding"):
+            self.framing.append(b"%s: %s\r\n" % (name, value))
+
+    def on_headers_complete(self):
+        if self.expect_continue and self.parser.get_http_version() == "1.1":
+            self.transport.write(_CONTINUE)
+        if self.framing and self.parser.should_upgrade():
+            # llhttp ends an upgrade request at its headers and leaves the
+            # body to the new protocol. Hold the request back and replay its
+            # request line and framing headers, minus the upgrade.
+            self.replay = b"%s %s HTTP/%s\r\n%s\r\n" % (
+                self.parser.get_method(),
+                self.url,
+                self.parser.get_http_version().encode("latin-1"),
+                b"".join(self.framing),
+            )
+
+    def on_body(self, body: bytes):
+        # Only buffer bodies a body match could use; decided on the first chunk.
+        if self.keep_body is None:
+            self.keep_body = needs_body(self.specs.routes, self._method(), self.url.decode("latin-1"))
+        if self.keep_body:
+            self.body.append(body)
+
+    def on_message_complete(self):
+        if self.replay is not None:
+            return
+        method = self._method()
+        target = self.url.decode("latin-1")
+        current = self.specs
+        status, frame = dispatch(current.routes, current.not_allowed, method, target, b"".join(self.body))
+        if method == "HEAD":
+            # A HEAD response never has a body; keep-alive clients would
+            # read it as the start of the next response.
+            frame = frame[: frame.index(b"\r\n\r\n") + 4]
+        self._write(frame)
+        if access_log:
+            _log_queue.append((method, target, status))
+            if not _log_ready.is_set():
+                _log_ready.set()
+        if not self.parser.should_keep_alive():
+            self.transport.close()
+
+    def _method(self) -> str:
+        raw_method = self.parser.get_method()
+        return _METHODS.get(raw_method) or raw_method.decode("latin-1").upper()
+
+    # A client pipelining faster than it reads would otherwise grow the
+    # transport's write buffer without bound.
+    def pause_writing(self):
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+    def _write(self, frame: bytes):
+        # Splice the shared Date header in after the prebuilt status line.
+        split = frame.index(b"\r\n") + 2
+        view = memoryview(frame)
+        self.transport.writelines((view[:split], _date_header, view[split:]))
+
+
+async def serve(port: int, sock: socket.socket | None = None, spec_dir: Path | None = None):
+    loop = asyncio.get_running_loop()
+    _refresh_date(loop)
+    if access_log:
+        threading.Thread(target=_log_writer, daemon=True).start()
+    if spec_dir is not None:
+        # Worker process: the parent watches the specs and signals changes.
+        loop.add_signal_handler(signal.SIGHUP, _load_routes, spec_dir)
+    if sock is not None:
+        server = await loop.create_server(MockProtocol, sock=sock)
+    else:
+        server = await loop.create_server(MockProtocol, "", port)
+    async with server:
+        await server.serve_forever()
+
+
+def _listen(port: int) -> socket.socket:
+    if socket.has_dualstack_ipv6():
+        return socket.create_server(("", port), family=socket.AF_INET6, dualstack_ipv6=True)
+    return socket.create_server(("", port))
+
+
+def run_workers(port: int, workers: int, spec_dir: Path, reload: bool) -> int:
+    """Serve from ``workers`` forked processes; returns the exit code for the CLI."""
+    # Bound once here and inherited by every worker: a busy port fails
+    # before forking, and no other process can join the accept queue.
+    sock = _listen(port)
+    pids: list[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Until the loop installs its handler, a reload must not kill us.
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            code = 0
+            try:
+                asyncio.run(serve(port, sock=sock, spec_dir=spec_dir))
+            except KeyboardInterrupt:
+                pass
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            sys.stdout.flush()
+            os._exit(code)
+        pids.append(pid)
+    sock.close()
+    running = set(pids)
+
+    if reload:
+        def signal_workers(_spec_dir: Path):
+            for pid in list(running):
+                os.kill(pid, signal.SIGHUP)
+            click.echo("  [reload] Specs reloaded")
+
+        watcher = _start_watcher(spec_dir, signal_workers)
+
+    def stop(_signum, _frame):
+        raise KeyboardInterrupt
+
+    # Stopping the parent (Ctrl+C or SIGTERM) stops every worker with it,
+    # and so does any worker exiting on its own.
+    signal.signal(signal.SIGTERM, stop)
+    code = 0
+    try:
+        while running:
+            pid, status = os.waitpid(-1, 0)
+            running.discard(pid)
+            if os.waitstatus_to_exitcode(status) != 0:
+                code = 1
+                break
+    except KeyboardInterrupt:
+        click.echo("\nShutting down.")
+    finally:
+        for pid in running:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in running:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        if reload:
+            _stop_watcher(*watcher)
+    return code
+
 
-    def _send(self, status: int, body: object):
-        payload = json.dumps(body).encode() if body is not None else b""
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(payload)))
-        self.end_headers()
-        if payload:
-            self.wfile.write(payload)
+def _load_routes(spec_dir: Path):
+    global specs
+    specs = load_specs(spec_dir)
 
-    def log_message(self, format, *args):
-        click.echo(f"  {self.command} {self.path} → {args[1] if len(args) > 1 else '?'}")
 
-    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_request
+def reload_specs(spec_dir: Path):
+    _load_routes(spec_dir)
+    click.echo("  [reload] Specs reloaded")
 
 
-def watch_reload(spec_dir: Path):
+def _is_spec_file(_change, path: str) -> bool:
+    return path.endswith((".yaml", ".json"))
+
+
+def watch_reload(spec_dir: Path, on_change=reload_specs, stop: threading.Event | None = None):
+    if stop is None:
+        stop = threading.Event()
+    if watch is None:
+        return poll_reload(spec_dir, on_change, stop)
+    for _changes in watch(spec_dir, watch_filter=_is_spec_file, debounce=200, stop_event=stop):
+        on_change(spec_dir)
+
+
+def poll_reload(spec_dir: Path, on_change=reload_specs, stop: threading.Event | None = None):
+    if stop is None:
+        stop = threading.Event()
+
     def snapshot():
         result = {}
         for p in spec_dir.rglob("*"):
@@ -181,43 +500,67 @@ def watch_reload(spec_dir: Path):
         return result
 
     mtimes = snapshot()
-    while True:
-        time.sleep(2)
+    while not stop.wait(2):
         current = snapshot()
         if current != mtimes:
             mtimes = current
-            global routes
-            routes = load_specs(spec_dir)
-            click.echo("  [reload] Specs reloaded")
+            on_change(spec_dir)
+
+
+# The watcher must be stopped and joined before the interpreter exits:
+# tearing down a thread blocked in the Rust watcher aborts the process.
+def _start_watcher(spec_dir: Path, on_change) -> tuple[threading.Thread, threading.Event]:
+    stop = threading.Event()
+    thread = threading.Thread(target=watch_reload, args=(spec_dir, on_change, stop), daemon=True)
+    thread.start()
+    click.echo("  watching for changes...")
+    return thread, stop
+
+
+def _stop_watcher(thread: threading.Thread, stop: threading.Event):
+    stop.set()
+    thread.join()
 
 
 @click.command()
 @click.option("-p", "--port", default=8000, type=int, help="Port to listen on.")
 @click.option("-d", "--dir", "spec_dir", default="./api", type=click.Path(exists=True, file_okay=False), help="Spec directory.")
 @click.option("--reload", is_flag=True, help="Watch for file changes and auto-reload.")
+@click.option("-w", "--workers", default=1, type=click.IntRange(min=1), help="Worker processes sharing one listening socket.")
+@click.option("-q", "--quiet", is_flag=True, help="Do not log requests.")
 @click.version_option(package_name="mockpath")
-def main(port: int, spec_dir: str, reload: bool):
+def main(port: int, spec_dir: str, reload: bool, workers: int, quiet: bool):
     """Lightweight HTTP mock server — directory structure as URL paths."""
+    global access_log
+    access_log = not quiet
+    if workers > 1 and not hasattr(os, "fork"):
+        raise click.BadParameter("multiple workers need os.fork, which this platform lacks", param_hint="--workers")
+
     spec_path = Path(spec_dir).resolve()
 
-    global routes
-    routes = load_specs(spec_path)
+    global specs
+    specs = load_specs(spec_path)
+    routes = specs.routes
 
     click.echo(f"mockpath listening on http://localhost:{port}")
     click.echo(f"  spec dir: {spec_path}")
-    click.echo(f"  routes loaded: {len(routes)}")
-    for (method, path) in sorted(routes):
-        r = routes[(method, path)]
+    click.echo(f"  routes loaded: {sum(len(by_path) for by_path in routes.values())}")
+    for method, path in sorted((m, p) for m, by_path in routes.items() for p in by_path):
+        r = routes[method][path]
         match_info = f" ({len(r.matches)} matches)" if r.matches else ""
         click.echo(f"    {method:6s} {path}{match_info}")
 
+    if workers > 1:
+        click.echo(f"  workers: {workers}")
+        sys.exit(run_workers(port, workers, spec_path, reload))
+
     if reload:
-        threading.Thread(target=watch_reload, args=(spec_path,), daemon=True).start()
-        click.echo("  watching for changes...")
+        watcher = _start_watcher(spec_path, reload_specs)
 
-    server = HTTPServer(("", port), MockHandler)
     try:
-        server.serve_forever()
+        asyncio.run(serve(port))
     except KeyboardInterrupt:
         click.echo("\nShutting down.")
-        server.shutdown()
+    finally:
+        if reload:
+            _stop_watcher(*watcher)
@@ -0,0 +1,195 @@
+"""Route tables and per-request matching.
+
+Kept free of I/O and fully annotated so it can be compiled with mypyc
+(see the opt-in build hook in pyproject.toml); cli.py builds the tables
+and owns the server.
+"""
+
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import unquote_plus, urlsplit
+
+import orjson
+
+
+@dataclass(slots=True, frozen=True)
+class MatchEntry:
+    params: dict[Any, Any] | None
+    request_body: Any
+    status: int
+    response: Any
+    frame: bytes
+    order: int = 0  # position in the spec's matches list
+
+
+@dataclass(slots=True, frozen=True)
+class RouteEntry:
+    status: int
+    default_response: Any
+    default_frame: bytes
+    matches: list[MatchEntry] = field(default_factory=list)
+    # One table per distinct set of param names, in spec order:
+    # (order of its first entry, names, {values: first entry with those values})
+    params_index: list[tuple[int, tuple[Any, ...], dict[tuple[Any, ...], MatchEntry]]] = field(default_factory=list)
+    body_matches: list[MatchEntry] = field(default_factory=list)
+    # Canonical JSON of the expected body -> first entry expecting it
+    body_index: dict[bytes, MatchEntry] = field(default_factory=dict)
+    body_fallback: list[MatchEntry] = field(default_factory=list)
+    # Every param name some match checks; other query keys are never decoded
+    needed_keys: frozenset[Any] = frozenset()
+
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def build_frame(status: int, payload: bytes, headers: bytes = b"") -> bytes:
+    return (
+        b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n%s"
+        % (status, _reason(status).encode("latin-1"), len(payload), headers, payload)
+    )
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def canonical(body: Any) -> bytes:
+    return orjson.dumps(_int_floats(body), option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+
+def _int_floats(value: Any) -> Any:
+    # 1 == 1.0 under deep equality, but orjson writes them differently;
+    # clients (JavaScript in particular) send 10 for 10.0.
+    if isinstance(value, float):
+        return int(value) if value.is_integer() and abs(value) < 2**63 else value
+    if isinstance(value, dict):
+        return {k: _int_floats(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_int_floats(v) for v in value]
+    return value
+
+
+_NOT_FOUND = build_frame(404, orjson.dumps({"error": "Not Found"}))
+_METHOD_NOT_ALLOWED_BODY = orjson.dumps({"error": "Method Not Allowed"})
+
+
+def method_not_allowed_frame(methods: set[str]) -> bytes:
+    allow = ", ".join(sorted(methods)).encode("latin-1")
+    return build_frame(405, _METHOD_NOT_ALLOWED_BODY, b"Allow: %s\r\n" % allow)
+
+
+def dispatch(
+    routes: dict[str, dict[str, RouteEntry]],
+    not_allowed: dict[str, bytes],
+    method: str,
+    target: str,
+    raw_body: bytes,
+) -> tuple[int, bytes]:
+    """Resolve a request to ``(status, frame)``; the frame is written to the socket as-is."""
+    path, query = _split_target(target)
+    route = _find_route(routes, method, path)
+    if route is None:
+        frame = not_allowed.get(path)
+        if frame is None:
+            return 404, _NOT_FOUND
+        return 405, frame
+
+    # Params are checked first since they need no body parse. A params hit
+    # still loses to any body match listed before it (first match wins).
+    hit = _match_params(route, query) if route.params_index else None
+
+    body_matches = route.body_matches
+    if body_matches and (hit is None or body_matches[0].order < hit.order):
+        # Clients often send exactly the canonical form; try it before re-encoding.
+        body_hit = route.body_index.get(raw_body) or route.body_index.get(_canonical_body(raw_body))
+        if route.body_fallback:
+            body = _parse_body(raw_body)
+            for m in route.body_fallback:
+                if body_hit is not None and m.order > body_hit.order:
+                    break
+                if body == m.request_body:
+                    body_hit = m
+                    break
+        if body_hit is not None and (hit is None or body_hit.order < hit.order):
+            return body_hit.status, body_hit.frame
+
+    if hit is not None:
+        return hit.status, hit.frame
+    return route.status, route.default_frame
+
+
+def needs_body(routes: dict[str, dict[str, RouteEntry]], method: str, target: str) -> bool:
+    """Whether the request body can affect the response, i.e. is worth buffering."""
+    route = _find_route(routes, method, _split_target(target)[0])
+    return route is not None and bool(route.body_matches)
+
+
+def _split_target(target: str) -> tuple[str, str]:
+    if not target.startswith("/"):
+        # Absolute form, as sent through HTTP_PROXY: drop scheme://authority
+        parts = urlsplit(target)
+        if parts.scheme:
+            target = parts.path + "?" + parts.query
+    if "#" in target:
+        target = target.partition("#")[0]
+    path, _, query = target.partition("?")
+    return path.rstrip("/") or "/", query
+
+
+def _find_route(routes: dict[str, dict[str, RouteEntry]], method: str, path: str) -> RouteEntry | None:
+    # Keyed method first so a lookup needs no (method, path) tuple
+    by_path = routes.get(method)
+    return by_path.get(path) if by_path is not None else None
+
+
+def _match_params(route: RouteEntry, query: str) -> MatchEntry | None:
+    # A route whose only params rule is ``params: {}`` needs no query at all
+    query_flat = _query_values(query, route.needed_keys) if route.needed_keys else {}
+
+    hit: MatchEntry | None = None
+    for first, names, table in route.params_index:
+        if hit is not None and first > hit.order:
+            break
+        m = table.get(tuple(query_flat.get(k) for k in names))
+        if m is not None and (hit is None or m.order < hit.order):
+            hit = m
+    return hit
+
+
+def _query_values(query: str, keys: frozenset[Any]) -> dict[str, Any]:
+    """``parse_qs`` limited to ``keys``, with repeated keys flattened to a tuple."""
+    found: dict[str, list[str]] = {}
+    for pair in query.split("&"):
+        name, sep, value = pair.partition("=")
+        # parse_qs drops pairs without "=" and blank values
+        if not sep or not value:
+            continue
+        if "%" in name or "+" in name:
+            name = unquote_plus(name)
+        if name not in keys:
+            continue
+        if "%" in value or "+" in value:
+            value = unquote_plus(value)
+        found.setdefault(name, []).append(value)
+    return {k: v[0] if len(v) == 1 else tuple(v) for k, v in found.items()}
+
+
+def _parse_body(raw_body: bytes) -> Any:
+    if not raw_body:
+        return None
+    try:
+        return orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _canonical_body(raw_body: bytes) -> bytes:
+    body = _parse_body(raw_body)
+    return canonical(body) if body is not None else b""
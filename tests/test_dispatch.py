@@ -0,0 +1,129 @@
+from urllib.parse import parse_qs
+
+import orjson
+import pytest
+
+from mockpath.cli import load_specs
+from mockpath.dispatch import _query_values, dispatch
+
+
+@pytest.fixture
+def serve_spec(tmp_path):
+    """Write ``files`` into a spec dir and return a ``request(method, target, body)`` helper."""
+
+    def build(files: dict[str, str]):
+        for name, content in files.items():
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        specs = load_specs(tmp_path)
+
+        def request(method: str, target: str, body: bytes = b""):
+            status, frame = dispatch(specs.routes, specs.not_allowed, method, target, body)
+            payload = frame.split(b"\r\n\r\n", 1)[1]
+            return status, orjson.loads(payload) if payload else None
+
+        return request
+
+    return build
+
+
+def test_empty_params_matches_any_query(serve_spec):
+    request = serve_spec({
+        "a/e.get.yaml": "matches:\n  - params: {}\n    response: {empty: true}\n",
+    })
+    assert request("GET", "/a/e?x=1") == (200, {"empty": True})
+    assert request("GET", "/a/e") == (200, {"empty": True})
+
+
+@pytest.mark.parametrize(
+    "spec_body, request_body",
+    [
+        ("{z: 1.0}", b'{"z": 1}'),
+        ("{x: 1}", b'{"x": 1.0}'),
+        ("{x: [2.0, {y: 3}]}", b'{"x": [2, {"y": 3.0}]}'),
+    ],
+)
+def test_body_match_treats_integral_floats_as_ints(serve_spec, spec_body, request_body):
+    request = serve_spec({
+        "a/p.post.yaml": f"matches:\n  - request: {spec_body}\n    response: {{hit: true}}\n",
+    })
+    assert request("POST", "/a/p", request_body) == (200, {"hit": True})
+    assert request("POST", "/a/p", b'{"z": 1.5, "x": 1.5}') == (200, None)
+
+
+@pytest.mark.parametrize(
+    "target",
+    ["http://host/a/p?a=1", "http://host:8000/a/p/?a=1#frag", "https://user@host/a/p?a=1"],
+)
+def test_absolute_form_target(serve_spec, target):
+    request = serve_spec({
+        "a/p.get.yaml": "matches:\n  - params: {a: '1'}\n    response: {hit: true}\n",
+    })
+    assert request("GET", target) == (200, {"hit": True})
+
+
+
+@pytest.mark.parametrize("referencing", ["a.get.yaml", "y.get.yaml"])
+def test_yaml_spec_referenced_as_json_is_not_served_from_yaml_cache(tmp_path, referencing):
+    # x.get.yaml is a spec in its own right and, here, a response_file; which
+    # one is parsed first depends on name order and must not matter.
+    (tmp_path / "x.get.yaml").write_text("status: 200\n")
+    (tmp_path / referencing).write_text("matches:\n  - params: {a: '1'}\n    response_file: x.get.yaml\n")
+    for _ in range(2):  # the second load goes through the parse cache
+        with pytest.raises(orjson.JSONDecodeError):
+            load_specs(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "a=1",
+        "a=1&a=2",  # repeated keys become a tuple
+        "a=1&b=2&a=3",
+        "a+b=c+d&a%20b=%2B",  # + and % in keys and values
+        "%61=1&a=%E2%82%AC",
+        "a=&b=1",  # blank values are dropped
+        "a&b=1&=2",  # so are pairs without "=" or without a name
+        "a=1&&b=2&",
+        "a=1=2",
+        "a=%zz&b=%",
+    ],
+)
+def test_query_values_match_parse_qs(query):
+    keys = frozenset({"a", "b", "a b", ""})
+    expected = {k: v[0] if len(v) == 1 else tuple(v) for k, v in parse_qs(query).items() if k in keys}
+    assert _query_values(query, keys) == expected
+
+
+def test_query_values_ignore_keys_not_needed():
+    assert _query_values("a=1&z=%E2%82%AC&z=2", frozenset({"a"})) == {"a": "1"}
+
+
+def test_params_match_ignores_extra_query_keys(serve_spec):
+    request = serve_spec({
+        "a/p.get.yaml": "matches:\n  - params: {a: '1', tag: [x, y]}\n    response: {hit: true}\n",
+    })
+    assert request("GET", "/a/p?z=0&a=1&tag=x&junk&tag=y&b=") == (200, {"hit": True})
+    assert request("GET", "/a/p?a=1&tag=x") == (200, None)
+    assert request("GET", "/a/p?a=2&tag=x&tag=y") == (200, None)
+
+
+@pytest.mark.parametrize(
+    "rules, expected",
+    [
+        # Different name sets live in different tables; spec order still decides.
+        ("- params: {b: '2'}\n    response: {rule: 1}\n  - params: {a: '1', b: '2'}\n    response: {rule: 2}\n", 1),
+        ("- params: {a: '1', b: '2'}\n    response: {rule: 1}\n  - params: {b: '2'}\n    response: {rule: 2}\n", 1),
+        ("- params: {a: '9'}\n    response: {rule: 1}\n  - params: {b: '2'}\n    response: {rule: 2}\n"
+         "  - params: {a: '1'}\n    response: {rule: 3}\n", 2),
+        # Same names and values twice: the first one wins.
+        ("- params: {a: '1'}\n    response: {rule: 1}\n  - params: {a: '1'}\n    response: {rule: 2}\n", 1),
+        # A rule no query can satisfy does not shadow later ones.
+        ("- params: {a: 1}\n    response: {rule: 1}\n  - params: {a: '1'}\n    response: {rule: 2}\n", 2),
+    ],
+)
+def test_params_earliest_match_wins(serve_spec, rules, expected):
+    request = serve_spec({"a/p.get.yaml": "matches:\n  " + rules})
+    assert request("GET", "/a/p?a=1&b=2") == (200, {"rule": expected})
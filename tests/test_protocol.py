@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from mockpath import cli
+
+
+@pytest.fixture
+def exchange(tmp_path, monkeypatch):
+    """Send raw bytes to a server on ``tmp_path`` and return everything it writes back."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "p.get.yaml").write_text("status: 200\n")
+    (tmp_path / "a" / "p.get.resp.json").write_text('{"ok": true}')
+    (tmp_path / "a" / "p.post.yaml").write_text("matches:\n  - request: {x: 1}\n    response: {hit: true}\n")
+    monkeypatch.setattr(cli, "specs", cli.load_specs(tmp_path))
+    monkeypatch.setattr(cli, "access_log", False)
+
+    async def run(*chunks: bytes) -> bytes:
+        loop = asyncio.get_running_loop()
+        cli._refresh_date(loop)
+        server = await loop.create_server(cli.MockProtocol, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname())
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(0.05)
+        writer.write_eof()
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        server.close()
+        return data
+
+    return lambda *chunks: asyncio.run(run(*chunks))
+
+
+def test_head_response_has_no_body(exchange):
+    data = exchange(b"HEAD /a/p HTTP/1.1\r\nHost: x\r\n\r\nGET /a/p HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    head, rest = data.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 405 ")
+    assert rest.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert rest.endswith(b'\r\n\r\n{"ok":true}')
+
+
+def test_upgrade_request_is_answered_as_http11(exchange):
+    data = exchange(
+        b"GET /a/p HTTP/1.1\r\nHost: x\r\nConnection: Upgrade, HTTP2-Settings\r\nUpgrade: h2c\r\n\r\n"
+        b"GET /a/p HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    )
+    assert data.count(b"HTTP/1.1 200 OK\r\n") == 2
+
+
+def test_callback_error_is_500_not_400(exchange, monkeypatch, capsys):
+    def boom(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(cli, "dispatch", boom)
+    data = exchange(b"GET /a/p HTTP/1.1\r\nHost: x\r\n\r\n")
+    assert data.startswith(b"HTTP/1.1 500 ")
+    assert "RuntimeError: boom" in capsys.readouterr().err
+
+
+def test_expect_100_continue(exchange):
+    data = exchange(
+        b"POST /a/p HTTP/1.1\r\nHost: x\r\nConnection: close\r\nExpect: 100-continue\r\nContent-Length: 7\r\n\r\n",
+        b'{"x":1}',
+    )
+    assert data.startswith(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\n")
+    assert data.endswith(b'{"hit":true}')
+
+
+@pytest.mark.parametrize(
+    "framing, body",
+    [
+        (b"Content-Length: 7\r\n", b'{"x":1}'),
+        (b"Transfer-Encoding: chunked\r\n", b'3\r\n{"x\r\n4\r\n":1}\r\n0\r\n\r\n'),
+    ],
+)
+def test_upgrade_request_body_is_read(exchange, framing, body):
+    head = b"POST /a/p HTTP/1.1\r\nHost: x\r\nConnection: Upgrade\r\nUpgrade: websocket\r\n" + framing + b"\r\n"
+    follow = b"GET /a/p HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    for chunks in [(head + body + follow,), (head, body, follow)]:
+        data = exchange(*chunks)
+        first, second = data.split(b"HTTP/1.1 ", 2)[1:]
+        assert first.startswith(b"200 OK\r\n") and first.endswith(b'{"hit":true}')
+        assert second.startswith(b"200 OK\r\n") and second.endswith(b'{"ok":true}')